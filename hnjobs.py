@@ -2,6 +2,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     Dict,
     Tuple,
     Any,
@@ -11,26 +12,55 @@ from typing import (
     Union,
     Iterable,
 )
-from enum import Enum
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from html.parser import HTMLParser
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import json
 from abc import ABCMeta, abstractmethod
+import bisect
 import concurrent.futures
+import functools
+import sqlite3
+import threading
+import zlib
+
+
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:
+
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
 
 try:
     import requests
 
     _session: requests.Session = requests.Session()
+    # Widen the connection pool so concurrent fetches keep using
+    # keep-alive connections instead of opening new ones
+    _adapter = requests.adapters.HTTPAdapter(
+        pool_connections=32, pool_maxsize=32
+    )
+    _session.mount("https://", _adapter)
+    _session.mount("http://", _adapter)
 
     def get_json(url: str) -> Optional[Dict[str, Any]]:
         response = _session.get(url)
         if not (200 <= response.status_code < 300):
             return None
-        return response.json()
+        return _loads(response.content)
 
 except ImportError:
     from urllib import request
@@ -39,7 +69,7 @@ except ImportError:
         response = request.urlopen(url)
         if not (200 <= response.status < 300):
             return None
-        return json.loads(response.read())
+        return _loads(response.read())
 
 
 if os.name == "posix":
@@ -47,24 +77,41 @@ if os.name == "posix":
     import tty
     import termios
 
+    class RawStdin(object):
+        """Context manager that puts the terminal in raw mode on entry
+        and restores it on exit, so a whole input loop pays the termios
+        round-trip once instead of once per keystroke"""
+
+        __slots__ = ("_old_settings",)
+
+        def __enter__(self) -> "RawStdin":
+            fd = sys.stdin.fileno()
+            self._old_settings = termios.tcgetattr(fd)
+            tty.setraw(fd)
+            return self
+
+        def __exit__(self, *exc_info) -> None:
+            termios.tcsetattr(
+                sys.stdin.fileno(), termios.TCSADRAIN, self._old_settings
+            )
+
     def getch() -> str:
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            ch = sys.stdin.read(1)
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return ch
+        with RawStdin():
+            return sys.stdin.read(1)
 
 else:
     print("Sorry, but only posix systems are supported for now")
     exit(1)
 
 
-PERSISTENT_CACHE: bool = True  # Everything is lost upon restart if False
+# The escape sequence `clear` emits: erase the display, home the cursor.
+# Written directly so refreshes do not fork a subprocess per frame
+_CLEAR: str = "\x1b[2J\x1b[H"
+
+PERSISTENT_CACHE: bool = True  # Items are lost upon restart if False
 HN_API_BASE_URL: str = "https://hacker-news.firebaseio.com/v0"
-SAVE_FILE: str = "hnjobs.json"
+SAVE_FILE: str = "hnjobs.json"  # Pre-sqlite save file, only read to migrate
+DB_FILE: str = "hnjobs.sqlite3"
 
 
 ##############
@@ -72,18 +119,12 @@ SAVE_FILE: str = "hnjobs.json"
 ##############
 
 
-class ItemType(str, Enum):
-    JOB = "job"
-    STORY = "story"
-    COMMENT = "comment"
-    POLL = "poll"
-    POLLOPT = "pollopt"
-
-
-@dataclass(kw_only=True, slots=False)
+@dataclass(kw_only=True, slots=True)
 class HNItem(object):
     id: int
-    type: ItemType
+    # "job", "story", "comment", "poll" or "pollopt"; kept as the raw
+    # API string since enum lookup is pure overhead per constructed item
+    type: str
     time: int  # Unix timestamp
     title: Optional[str] = None
     text: Optional[str] = None  # In HTML
@@ -97,6 +138,18 @@ class HNItem(object):
     score: Optional[int] = None
     poll: Optional[int] = None
     parts: Optional[List[int]] = None
+    # zlib-compressed `text`, set by _cache_insert: comment HTML
+    # compresses ~4x, a large saving across thousands of cached items.
+    # Read through item_text(); never persisted
+    _text_gz: Optional[bytes] = None
+
+
+def item_text(item: HNItem) -> Optional[str]:
+    """Return the item's HTML text, decompressing the in-memory copy if
+    the cache compressed it"""
+    if item._text_gz is not None:
+        return zlib.decompress(item._text_gz).decode("utf-8")
+    return item.text
 
 
 def get_item_no_cache(id_: int) -> Optional[HNItem]:
@@ -106,16 +159,136 @@ def get_item_no_cache(id_: int) -> Optional[HNItem]:
     return HNItem(**dict_item)
 
 
-_item_cache: Dict[int, HNItem] = {}
+# LRU bounded by MAX_CACHED_ITEMS so long sessions spanning several
+# WhoIsHiring threads do not grow memory without limit
+MAX_CACHED_ITEMS: int = 5000
+
+_item_cache: "OrderedDict[int, HNItem]" = OrderedDict()
+_item_cache_lock = threading.Lock()
+
+# Columns mirroring _item_cache for the fields read by filter/sort hot
+# loops, so scans touch small flat dicts instead of dereferencing whole
+# HNItem objects. _col_text_lower holds lowercased UTF-8 text so that
+# substring filters run as C-level bytes searches
+_col_time: Dict[int, int] = {}
+_col_type: Dict[int, str] = {}
+_col_text_lower: Dict[int, bytes] = {}
+
+# (time, id) pairs kept sorted on insert, so a "recent" ordering is read
+# off the index instead of re-sorting the selection on every query
+_recent_index: List[Tuple[int, int]] = []
+
+
+def _cache_insert(item: HNItem) -> None:
+    # Usernames and types repeat across items; interning collapses the
+    # duplicates in the long-lived cache
+    if item.by is not None:
+        item.by = sys.intern(item.by)
+    item.type = sys.intern(item.type)
+    with _item_cache_lock:
+        if item.id not in _item_cache:
+            bisect.insort(_recent_index, (item.time, item.id))
+        _item_cache[item.id] = item
+        _item_cache.move_to_end(item.id)
+        _col_time[item.id] = item.time
+        _col_type[item.id] = item.type
+        if item.text:
+            _col_text_lower[item.id] = (
+                item.text.lower().encode("utf-8", "ignore")
+            )
+            # Keep only a compressed copy in memory; level 1 is fast and
+            # still shrinks HTML prose several times over. Filters read
+            # the column above, so they never decompress
+            item._text_gz = zlib.compress(item.text.encode("utf-8"), 1)
+            item.text = None
+        if len(_item_cache) <= MAX_CACHED_ITEMS:
+            return
+        # Evict the least recently used item, but keep rated/tagged
+        # items pinned since the user has invested work in them
+        evict = next(
+            (
+                id_ for id_ in _item_cache
+                if id_ not in _item_user_ratings
+                and id_ not in _item_user_tags
+            ),
+            None,
+        )
+        if evict is not None:
+            del _item_cache[evict]
+            del _recent_index[
+                bisect.bisect_left(_recent_index, (_col_time[evict], evict))
+            ]
+            del _col_time[evict]
+            del _col_type[evict]
+            _col_text_lower.pop(evict, None)
+
+
+_db: Optional[sqlite3.Connection] = None
+_db_lock = threading.Lock()
+
+
+def _open_db() -> sqlite3.Connection:
+    db = sqlite3.connect(DB_FILE, check_same_thread=False)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, blob BLOB)"
+    )
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS tags (id INTEGER PRIMARY KEY, blob BLOB)"
+    )
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS ratings"
+        " (id INTEGER PRIMARY KEY, rating INTEGER)"
+    )
+    return db
+
+
+def _item_to_dict(item: HNItem) -> Dict[str, Any]:
+    d = {
+        f.name: getattr(item, f.name)
+        for f in fields(HNItem)
+        if not f.name.startswith("_")
+    }
+    # The in-memory copy may have been compressed by _cache_insert
+    d["text"] = item_text(item)
+    return d
+
+
+def _db_get_item(id_: int) -> Optional[HNItem]:
+    if _db is None:
+        return None
+    with _db_lock:
+        row = _db.execute(
+            "SELECT blob FROM items WHERE id = ?", (id_,)
+        ).fetchone()
+    if row is None:
+        return None
+    return HNItem(**_loads(row[0]))
+
+
+def _db_put_item(item: HNItem) -> None:
+    if _db is None or not PERSISTENT_CACHE:
+        return
+    with _db_lock:
+        _db.execute(
+            "INSERT OR REPLACE INTO items (id, blob) VALUES (?, ?)",
+            (item.id, _dumps(_item_to_dict(item))),
+        )
 
 
 def get_item_cached(id_: int) -> Optional[HNItem]:
     if (item := _item_cache.get(id_, None)) is not None:
+        with _item_cache_lock:
+            if id_ in _item_cache:
+                _item_cache.move_to_end(id_)
         return item
 
-    item = get_item_no_cache(id_)
+    item = _db_get_item(id_)
+    if item is None:
+        item = get_item_no_cache(id_)
+        if item is not None:
+            _db_put_item(item)
     if item is not None:
-        _item_cache[id_] = item
+        _cache_insert(item)
 
     return item
 
@@ -123,6 +296,53 @@ def get_item_cached(id_: int) -> Optional[HNItem]:
 get_item = get_item_cached
 
 
+try:
+    import asyncio
+    import httpx
+    # httpx only raises for missing HTTP/2 support when the client is
+    # constructed; probe for it here so we fall back to the thread pool
+    import h2  # noqa: F401
+
+    def fetch_items_bulk(
+        ids: Sequence[int],
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Fetch many items concurrently over a single HTTP/2 connection
+        (multiplexed streams) and populate the item cache. `progress` is
+        called with the number of items fetched so far."""
+
+        async def _fetch_all() -> None:
+            limits = httpx.Limits(
+                max_connections=1, max_keepalive_connections=1
+            )
+            async with httpx.AsyncClient(
+                http2=True, limits=limits
+            ) as client:
+                n = 0
+
+                async def _fetch_one(id_: int) -> None:
+                    nonlocal n
+                    response = await client.get(
+                        f"{HN_API_BASE_URL}/item/{id_}.json"
+                    )
+                    if 200 <= response.status_code < 300:
+                        dict_item = _loads(response.content)
+                        if dict_item is not None:
+                            item = HNItem(**dict_item)
+                            _db_put_item(item)
+                            _cache_insert(item)
+                    n += 1
+                    if progress is not None:
+                        progress(n)
+
+                await asyncio.gather(*[_fetch_one(i) for i in ids])
+
+        asyncio.run(_fetch_all())
+
+except ImportError:
+    fetch_items_bulk = None  # type: ignore
+
+
 class CustomHTMLParser(HTMLParser):
     """An HTML Parser that interprets <br> and <p> tags and replaces
     them with line breaks"""
@@ -151,20 +371,38 @@ class CustomHTMLParser(HTMLParser):
         self.parts.append(data)
 
 
-def html_to_text(html: Optional[str]) -> str:
-    if html is None:
-        return ""
-    parser = CustomHTMLParser()
-    parser.feed(html)
-    parser.close()
-    return parser.get_text()
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+
+    # Memoized since the same comments are re-rendered on every
+    # next/previous navigation
+    @functools.lru_cache(maxsize=1024)
+    def html_to_text(html: Optional[str]) -> str:
+        if html is None:
+            return ""
+        # Turn HN's line-break markup into actual line breaks before
+        # handing the rest over to the C parser
+        html = html.replace("<p>", "\n\n").replace("<br>", "\n")
+        return _FastHTMLParser(html).text()
+
+except ImportError:
+
+    @functools.lru_cache(maxsize=1024)
+    def html_to_text(html: Optional[str]) -> str:
+        if html is None:
+            return ""
+        parser = CustomHTMLParser()
+        parser.feed(html)
+        parser.close()
+        return parser.get_text()
 
 
 def display_item(item: HNItem) -> None:
-    os.system("clear")
+    sys.stdout.write(_CLEAR)
+    sys.stdout.flush()
     if item.title is not None:
         print(f"{item.title}\n")
-    print(html_to_text(item.text))
+    print(html_to_text(item_text(item)))
 
 
 def get_all_kids(base_item: HNItem) -> Generator[HNItem, None, None]:
@@ -202,6 +440,9 @@ class UserInterface(object, metaclass=ABCMeta):
     _tooltips_line: ClassVar[str]
     # Assigns shortcuts to command functions
     _tooltips_dict: ClassVar[Dict[str, Callable[[Any], None]]]
+    # Flat dispatch table indexed by ord(shortcut), so the input loop
+    # does an array lookup instead of hashing per keystroke
+    _tooltips_table: ClassVar[List[Optional[Callable[[Any], None]]]]
     _run: bool
 
     def __init__(self):
@@ -224,16 +465,27 @@ class UserInterface(object, metaclass=ABCMeta):
     def __init_subclass__(cls, /, **kwargs) -> None:
         super().__init_subclass__(**kwargs)
 
+        # Start from the commands parent classes already registered, then
+        # scan only this class's own namespace instead of getattr-ing
+        # every name dir() can see
         ttd: Dict[str, Callable[[Any], None]] = {}
-        for attr_name in dir(cls):
-            try:
-                attr = getattr(cls, attr_name)
-            except AttributeError:
-                continue
+        for base in reversed(cls.__mro__[1:]):
+            ttd.update(getattr(base, "_tooltips_dict", {}))
+        for attr in cls.__dict__.values():
             if (sc := getattr(attr, "__shortcut__", None)) is not None:
+                # An override replaces the inherited command, whatever
+                # shortcut that one ended up with
+                for k, v in list(ttd.items()):
+                    if v.__name__ == attr.__name__:
+                        del ttd[k]
                 cls.register_command(ttd, sc, attr)
         cls._tooltips_dict = ttd
 
+        table: List[Optional[Callable[[Any], None]]] = [None] * 128
+        for k, v in ttd.items():
+            table[ord(k)] = v
+        cls._tooltips_table = table
+
         tooltips: List[str] = []
         for k, v in ttd.items():
             name = v.__name__
@@ -243,25 +495,33 @@ class UserInterface(object, metaclass=ABCMeta):
         cls._tooltips_line = " ".join(tooltips)
 
     def wait_command(self) -> None:
-        while True:
-            ch = getch()
-            if ch not in self._tooltips_dict:
-                continue
-            break
-        self._tooltips_dict[ch](self)
+        with RawStdin():
+            while True:
+                # A blocking read in raw mode sleeps in the kernel until
+                # a key arrives; select() would deadlock here since
+                # read(1) buffers any extra bytes of a burst (escape
+                # sequences, pasted input) where select cannot see them
+                ch = sys.stdin.read(1)
+                func = (
+                    self._tooltips_table[ord(ch)]
+                    if len(ch) == 1 and ord(ch) < 128
+                    else None
+                )
+                if func is not None:
+                    break
+        # Run the command outside raw mode so it can use input()
+        func(self)
 
     @abstractmethod
     def update_display(self) -> str:
         raise NotImplementedError
 
-    @classmethod
-    def print_tooltips(cls) -> None:
-        print(f"{cls._tooltips_line}\n\n")
-
     def refresh(self) -> None:
-        os.system("clear")
-        self.print_tooltips()
-        print(self.update_display())
+        # Build the whole frame and write it in a single syscall
+        sys.stdout.write(
+            f"{_CLEAR}{self._tooltips_line}\n\n\n{self.update_display()}\n"
+        )
+        sys.stdout.flush()
 
     def loop(self) -> None:
         while self._run:
@@ -272,7 +532,8 @@ class UserInterface(object, metaclass=ABCMeta):
         self._run = False
 
 
-_item_user_tags: Dict[int, List[str]] = defaultdict(list)
+# Sets so tag filters test membership in O(1) instead of scanning lists
+_item_user_tags: Dict[int, Set[str]] = defaultdict(set)
 _item_user_ratings: Dict[int, int] = {}
 
 
@@ -327,15 +588,33 @@ class MainInterface(UserInterface):
                 break
             self.display += "\nplease enter y or n"
             self.refresh()
-        total = len(item.kids)
+        uncached = []
+        for i in item.kids:
+            if i in _item_cache:
+                continue
+            if (cached := _db_get_item(i)) is not None:
+                _cache_insert(cached)
+                continue
+            uncached.append(i)
+        total = len(uncached)
         self.display_now(f"fetching {total} items...")
 
-        n = 0
-        with concurrent.futures.ThreadPoolExecutor(
-                max_workers=min(32, os.cpu_count() * 5)) as executor:
-            for future in executor.map(get_item, item.kids):
-                n += 1
+        def progress(n: int) -> None:
+            # Redraw every few items only: a full refresh per item would
+            # dominate the fetch, especially on warm-cache runs
+            if n % 10 == 0 or n == total:
                 self.display_now(f"{n}/{total} comments fetched")
+
+        if fetch_items_bulk is not None:
+            fetch_items_bulk(uncached, progress=progress)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(32, os.cpu_count() * 5)) as executor:
+                futures = [executor.submit(get_item, i) for i in uncached]
+                for n, future in enumerate(
+                        concurrent.futures.as_completed(futures), start=1):
+                    future.result()
+                    progress(n)
         self.display += "\ndone."
 
     @command
@@ -348,10 +627,24 @@ class InvalidFilterOrSorter(Exception):
 
 
 FILTER_FUNCS = {
-    "tag": lambda tag: lambda item: tag in _item_user_tags[item.id],
+    # .get instead of defaultdict indexing: a lookup miss must not
+    # insert an empty entry for every item ever examined
+    "tag": lambda tag: lambda item: tag in _item_user_tags.get(item.id, ()),
     "rated": lambda _: lambda item: item.id in _item_user_ratings,
-    "contains": lambda s: lambda item:
-    item.text and (s.lower() in item.text.lower()),
+    # The needle is lowercased and encoded once at closure creation; the
+    # haystack is the bytes column, so each test is a single C-level
+    # bytes search
+    "contains": lambda s: lambda item, q=s.lower().encode("utf-8", "ignore"):
+    (t := _col_text_lower.get(item.id)) is not None and q in t,
+}
+
+
+# Bulk variants operating on the whole candidate id set at once, with
+# C-level set operations instead of one closure call per item
+FILTER_FUNCS_BULK = {
+    "tag": lambda tag: lambda ids:
+    {i for i in ids if tag in _item_user_tags.get(i, ())},
+    "rated": lambda _: lambda ids: ids & _item_user_ratings.keys(),
 }
 
 
@@ -377,15 +670,43 @@ def filter_from_str(s: str) -> Callable:
         raise InvalidFilterOrSorter(e)
 
 
+def bulk_filter_from_str(s: str) -> Optional[Callable]:
+    """Compile a filter string to its set-based bulk form, or None if
+    the filter only exists in per-item form"""
+    inverted = False
+    if s.startswith("!"):
+        inverted = True
+        s = s[1:]
+    parts = s.split(":")
+    if len(parts) == 1:
+        filter_name, arg = parts[0], None
+    elif len(parts) == 2:
+        filter_name, arg = parts
+    else:
+        raise InvalidFilterOrSorter("Too many ':'")
+
+    if filter_name not in FILTER_FUNCS_BULK:
+        return None
+    try:
+        func = FILTER_FUNCS_BULK[filter_name](arg)
+        if inverted:
+            return lambda ids: ids - func(ids)
+        return func
+    except Exception as e:
+        raise InvalidFilterOrSorter(e)
+
+
 SORTER_FUNCS = {
     "tag": lambda tag: lambda item:
-    0 if tag in _item_user_tags[item.id] else 1,
-    "recent": lambda _: lambda item: -item.time,
+    0 if tag in _item_user_tags.get(item.id, ()) else 1,
+    "recent": lambda _: lambda item: -_col_time[item.id],
     # It is strange to compare int with floats, but inf is quite useful here...
     "rating": lambda _: lambda item:
     -_item_user_ratings.get(item.id, float("-inf")),
-    "contains": lambda s: lambda item:
-    0 if (item.text and (s.lower() in item.text.lower())) else 1,
+    "contains": lambda s: lambda item, q=s.lower().encode("utf-8", "ignore"):
+    0 if (
+        (t := _col_text_lower.get(item.id)) is not None and q in t
+    ) else 1,
 }
 
 
@@ -412,7 +733,10 @@ def sorter_from_str(s: str) -> Callable:
 
 
 class SelectorInterface(UserInterface):
-    __slots__ = "display", "filters", "sorters"
+    __slots__ = (
+        "display", "filters", "sorters",
+        "_compiled_filters", "_compiled_sorters",
+    )
 
     display: str
     help: ClassVar[str] = (
@@ -423,6 +747,10 @@ class SelectorInterface(UserInterface):
     )
     filters: List[str]
     sorters: List[str]
+    # Filters/sorters compiled once on update instead of re-parsed on
+    # every selection; filters carry their (optional) bulk form
+    _compiled_filters: List[Tuple[Optional[Callable], Callable]]
+    _compiled_sorters: List[Callable]
 
     def _summary(self) -> None:
         self.display = (
@@ -436,6 +764,8 @@ class SelectorInterface(UserInterface):
         super().__init__()
         self.filters = []
         self.sorters = []
+        self._compiled_filters = []
+        self._compiled_sorters = []
         self._summary()
 
     def update_display(self) -> str:
@@ -453,13 +783,16 @@ class SelectorInterface(UserInterface):
         else:
             new_filters = new_filters_str.replace(" ", "").split(",")
 
+        compiled = []
         for f in new_filters:
             try:
-                filter_from_str(f)
+                compiled.append((bulk_filter_from_str(f),
+                                 filter_from_str(f)))
             except InvalidFilterOrSorter as e:
                 self.display += f"Filter {f} is invalid: {e}"
                 return
         self.filters = new_filters
+        self._compiled_filters = compiled
         self._summary()
 
     @command("s")
@@ -469,24 +802,49 @@ class SelectorInterface(UserInterface):
             new_sorters = []
         else:
             new_sorters = new_sorters_str.replace(" ", "").split(",")
+        compiled = []
         for s in new_sorters:
             try:
-                sorter_from_str(s)
+                compiled.append(sorter_from_str(s))
             except InvalidFilterOrSorter as e:
                 self.display += f"Sorter {s} is invalid: {e}"
                 return
         self.sorters = new_sorters
+        self._compiled_sorters = compiled
         self._summary()
 
     def _get_selected(self) -> List[HNItem]:
-        items: Iterable[HNItem] = filter(
-            lambda item: item.type == ItemType.COMMENT, _item_cache.values()
+        ids = {id_ for id_, t in _col_type.items() if t == "comment"}
+        # Narrow the id set with the bulk filters first; only the
+        # remaining items pay a Python-level call per filter
+        item_filters: List[Callable] = []
+        for bulk, per_item in self._compiled_filters:
+            if bulk is not None:
+                ids = bulk(ids)
+            else:
+                item_filters.append(per_item)
+        items: Iterable[HNItem] = (
+            item for id_, item in _item_cache.items() if id_ in ids
         )
-        for f in self.filters:
-            items = filter(filter_from_str(f), items)
+        for f in item_filters:
+            items = filter(f, items)
+        if self.sorters == ["recent"]:
+            # Most-recent-first is read straight off the index: O(K)
+            # for K selected items instead of an O(N log N) sort
+            selected = {item.id for item in items}
+            return [
+                _item_cache[id_]
+                for _, id_ in reversed(_recent_index)
+                if id_ in selected
+            ]
         filtered_items: List[HNItem] = list(items)
-        for s in self.sorters[::-1]:
-            filtered_items.sort(key=sorter_from_str(s))
+        if self._compiled_sorters:
+            # A single sort on a composite key is equivalent to one
+            # stable sort pass per sorter, applied in reverse
+            keys = self._compiled_sorters
+            filtered_items.sort(
+                key=lambda item: tuple(k(item) for k in keys)
+            )
         return filtered_items
 
     @command
@@ -503,9 +861,7 @@ class SelectorInterface(UserInterface):
     def tag_selected(self) -> None:
         tag = input("\nEnter the tag to add to matching items: ")
         for item in self._get_selected():
-            tags = _item_user_tags[item.id]
-            if tag not in tags:
-                tags.append(tag)
+            _item_user_tags[item.id].add(tag)
 
     @command
     def quit(self) -> None:
@@ -535,9 +891,9 @@ class ReviewInterface(UserInterface):
         return (
             f"Item {self.current_index + 1}/{len(self.items)}\n"
             f"Rating: {_item_user_ratings.get(item.id, '???')}\n"
-            f"Tags: {_item_user_tags[item.id]}\n"
+            f"Tags: {_item_user_tags.get(item.id, set())}\n"
             "===============================================================\n"
-            f"{html_to_text(item.text)}"
+            f"{html_to_text(item_text(item))}"
         )
 
     @command
@@ -554,9 +910,7 @@ class ReviewInterface(UserInterface):
     def add_tags(self) -> None:
         tags = _item_user_tags[self.current_item.id]
         new_tags = input("Enter new tags separated by ',':\n").split("'")
-        for tag in new_tags:
-            if tag not in tags:
-                tags.append(tag)
+        tags.update(new_tags)
 
     @command
     def rate(self):
@@ -594,9 +948,9 @@ class QuickReviewInterface(UserInterface):
         return (
             f"Item {self.current_index + 1}/{len(self.items)}\n"
             f"Rating: {_item_user_ratings.get(item.id, '???')}\n"
-            f"Tags: {_item_user_tags[item.id]}\n"
+            f"Tags: {_item_user_tags.get(item.id, set())}\n"
             "===============================================================\n"
-            f"{html_to_text(item.text)}"
+            f"{html_to_text(item_text(item))}"
         )
 
     @command
@@ -613,9 +967,7 @@ class QuickReviewInterface(UserInterface):
     def add_tags(self) -> None:
         tags = _item_user_tags[self.current_item.id]
         new_tags = input("Enter new tags separated by ',':\n").split("'")
-        for tag in new_tags:
-            if tag not in tags:
-                tags.append(tag)
+        tags.update(new_tags)
 
     @command("j")
     def no_0(self) -> None:
@@ -643,39 +995,78 @@ class QuickReviewInterface(UserInterface):
 
 
 def save() -> None:
-    to_save = {
-        "tags": _item_user_tags,
-        "ratings": _item_user_ratings,
-    }
-
-    if PERSISTENT_CACHE:
-        to_save["cache"] = dict(
-            (k, v.__dict__)
-            for k, v in _item_cache.items()
-        )
-
-    json.dump(to_save, open(SAVE_FILE, "w"))
+    """Flush tags and ratings to the database; items are already written
+    through on insert"""
+    if _db is None:
+        return
+    with _db_lock:
+        for id_, tags in _item_user_tags.items():
+            _db.execute(
+                "INSERT OR REPLACE INTO tags (id, blob) VALUES (?, ?)",
+                (id_, _dumps(sorted(tags))),
+            )
+        for id_, rating in _item_user_ratings.items():
+            _db.execute(
+                "INSERT OR REPLACE INTO ratings (id, rating) VALUES (?, ?)",
+                (id_, rating),
+            )
+        _db.commit()
+
+
+def _migrate_legacy_save() -> None:
+    """Import a pre-sqlite JSON save file into the database, then move it
+    out of the way"""
+    if _db is None or not os.path.exists(SAVE_FILE):
+        return
+    with open(SAVE_FILE, "rb") as f:
+        loaded: dict = _loads(f.read())
+    with _db_lock:
+        for k, v in loaded["tags"].items():
+            _db.execute(
+                "INSERT OR REPLACE INTO tags (id, blob) VALUES (?, ?)",
+                (int(k, 10), _dumps(v)),
+            )
+        for k, v in loaded["ratings"].items():
+            _db.execute(
+                "INSERT OR REPLACE INTO ratings (id, rating) VALUES (?, ?)",
+                (int(k, 10), v),
+            )
+        for k, v in loaded.get("cache", {}).items():
+            _db.execute(
+                "INSERT OR REPLACE INTO items (id, blob) VALUES (?, ?)",
+                (int(k, 10), _dumps(v)),
+            )
+        _db.commit()
+    os.replace(SAVE_FILE, SAVE_FILE + ".bak")
 
 
 def load() -> None:
+    global _db
     global _item_user_tags
     global _item_user_ratings
-    global _item_cache
-    loaded: dict = json.load(open(SAVE_FILE, "r"))
 
-    _item_user_tags = defaultdict(
-        list, ((int(k), v) for k, v in loaded["tags"].items())
-    )
+    _db = _open_db()
+    _migrate_legacy_save()
 
-    _item_user_ratings = dict(
-        (int(k), v)
-        for k, v in loaded["ratings"].items()
-    )
+    with _db_lock:
+        tag_rows = _db.execute("SELECT id, blob FROM tags").fetchall()
+        rating_rows = _db.execute("SELECT id, rating FROM ratings").fetchall()
+        # Hydrate the LRU with the newest items (HN ids grow over time);
+        # _get_selected only sees the in-memory cache, so without this a
+        # restart would present an empty selection
+        item_rows = _db.execute(
+            "SELECT blob FROM items ORDER BY id DESC LIMIT ?",
+            (MAX_CACHED_ITEMS,),
+        ).fetchall()
 
-    _item_cache = dict(
-        (int(k, 10), HNItem(**v))
-        for k, v in loaded.get("cache", {}).items()
+    _item_user_tags = defaultdict(
+        set, ((id_, set(_loads(blob))) for id_, blob in tag_rows)
     )
+    _item_user_ratings = dict(rating_rows)
+
+    # Oldest first, so the newest items end up most recently used
+    for (blob,) in reversed(item_rows):
+        _cache_insert(HNItem(**_loads(blob)))
 
 
 def main() -> None:
@@ -684,10 +1075,7 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    try:
-        load()
-    except FileNotFoundError:
-        pass
+    load()
 
     try:
         main()